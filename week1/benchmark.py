@@ -0,0 +1,122 @@
+import argparse
+import json
+import os
+import random
+import time
+
+import factorization
+from factorization import factorize
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'bench_baseline.json')
+
+
+def _primes_near(start: int, count: int) -> list:
+    primes = []
+    candidate = start | 1
+    while len(primes) < count:
+        if factorization.is_probable_prime(candidate):
+            primes.append(candidate)
+        candidate += 2
+    return primes
+
+
+def build_cases(seed: int = 0) -> dict:
+    """Returns fixed input sets for every benchmarked category"""
+    rnd = random.Random(seed)
+    small_primes = _primes_near(10 ** 5, 40)
+    return {
+        'small_ints': [rnd.randrange(2, 10 ** 6) for _ in range(2000)],
+        'semiprimes': [rnd.choice(small_primes) * rnd.choice(small_primes)
+                       for _ in range(200)],
+        'highly_composite': [720720, 1081080, 2162160, 9699690,
+                             2 ** 20 * 3 ** 10, 223092870, 6469693230,
+                             200560490130] * 25,
+        'large_primes': [2 ** 61 - 1, 10 ** 18 + 9, 4294967311,
+                         1000000000039] * 25,
+    }
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def run_case(numbers: list, repeat: int) -> dict:
+    """Times factorize() on every number, returns ops/sec and latencies"""
+    timings = []
+    for _ in range(repeat):
+        for x in numbers:
+            start = time.perf_counter_ns()
+            factorize(x)
+            timings.append(time.perf_counter_ns() - start)
+    timings.sort()
+    return {
+        'ops_per_sec': len(timings) / (sum(timings) / 1e9),
+        'p50_us': _percentile(timings, 0.50) / 1e3,
+        'p99_us': _percentile(timings, 0.99) / 1e3,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Returns descriptions of cases that regressed beyond tolerance"""
+    regressions = []
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        if stats['ops_per_sec'] < base['ops_per_sec'] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {stats['ops_per_sec']:.0f} ops/sec, "
+                f"baseline {base['ops_per_sec']:.0f}")
+        if stats['p99_us'] > base['p99_us'] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p99 {stats['p99_us']:.1f} us, "
+                f"baseline {base['p99_us']:.1f} us")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='factorize() benchmark')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='overwrite baseline with current results')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed relative slowdown, 0.25 is 25%%')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    factorization.disable_cache()
+    factorization.get_sieve()  # sieve construction is not benchmarked
+
+    results = {}
+    for name, numbers in build_cases().items():
+        results[name] = run_case(numbers, args.repeat)
+        print(f"{name:<18} {results[name]['ops_per_sec']:>12.0f} ops/sec  "
+              f"p50 {results[name]['p50_us']:>9.1f} us  "
+              f"p99 {results[name]['p99_us']:>9.1f} us")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=4)
+        print(f'Baseline saved to {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}, run with --save-baseline')
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        regressions = compare(results, json.load(baseline_file),
+                              args.tolerance)
+    if regressions:
+        print('PERFORMANCE REGRESSION:')
+        for regression in regressions:
+            print(f'  {regression}')
+        return 1
+    print('No regressions against baseline')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,372 @@
+import math
+import os
+import random
+from array import array
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+
+DEFAULT_SIEVE_BOUND = 1 << 20
+# Numbers above this use Pollard's rho instead of trial division
+TRIAL_DIVISION_LIMIT = 1 << 32
+# Number of small primes stripped by trial division before Pollard's rho
+RHO_TRIAL_PRIMES = 168
+# Witnesses making Miller-Rabin deterministic for n < 3.3 * 10 ** 24
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+class Sieve:
+    """
+    Smallest-prime-factor table for all integers below bound.
+    Numbers below bound are factorized by repeated lookups in the table,
+    bigger numbers are reduced by trial division with the cached primes.
+    """
+
+    def __init__(self, bound: int = DEFAULT_SIEVE_BOUND):
+        if bound < 2:
+            raise ValueError('Sieve bound must be at least 2')
+        self.bound = bound
+        self.spf = array('I', range(bound))
+        for number in range(2, int(bound ** 0.5) + 1):
+            if self.spf[number] != number:
+                continue
+            for multiple in range(number * number, bound, number):
+                if self.spf[multiple] == multiple:
+                    self.spf[multiple] = number
+        self.primes = array(
+            'I', (number for number in range(2, bound)
+                  if self.spf[number] == number))
+
+    def factorize_small(self, x: int) -> list:
+        """Returns factors of 1 < x < bound with multiplicity"""
+        factors = []
+        spf = self.spf
+        while x > 1:
+            prime = spf[x]
+            factors.append(prime)
+            x //= prime
+        return factors
+
+    def factorize(self, x: int) -> list:
+        """Returns factors of x > 1 with multiplicity"""
+        if x < self.bound:
+            return self.factorize_small(x)
+
+        factors = []
+        for prime in self.primes:
+            if prime * prime > x:
+                break
+            while x % prime == 0:
+                factors.append(prime)
+                x //= prime
+            if x < self.bound:
+                factors.extend(self.factorize_small(x))
+                return factors
+        else:
+            # all cached primes are exhausted, continue with odd divisors
+            divisor = self.bound | 1
+            while divisor * divisor <= x:
+                while x % divisor == 0:
+                    factors.append(divisor)
+                    x //= divisor
+                divisor += 2
+
+        if x > 1:
+            factors.append(x)
+        return factors
+
+
+def is_probable_prime(n: int) -> bool:
+    """
+    Miller-Rabin primality test. The answer is exact for
+    n < 3.3 * 10 ** 24 and has negligible error probability above it.
+    """
+    if n < 2:
+        return False
+    for base in MILLER_RABIN_BASES:
+        if n % base == 0:
+            return n == base
+
+    d = n - 1
+    shift = 0
+    while d % 2 == 0:
+        d //= 2
+        shift += 1
+
+    for base in MILLER_RABIN_BASES:
+        y = pow(base, d, n)
+        if y == 1 or y == n - 1:
+            continue
+        for _ in range(shift - 1):
+            y = y * y % n
+            if y == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def brent_rho(n: int) -> int:
+    """Returns non-trivial divisor of odd composite n (Brent's variant)"""
+    while True:
+        y = random.randrange(1, n)
+        c = random.randrange(1, n)
+        batch = 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(batch, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += batch
+            r *= 2
+
+        if g == n:
+            # batch overshot the cycle, step back one value at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def integer_root(n: int, k: int) -> int:
+    """Returns floor of k-th root of n >= 1 (Newton's method on integers)"""
+    if k == 2:
+        return math.isqrt(n)
+    x = 1 << -(-n.bit_length() // k)
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def perfect_power(n: int, min_root: int) -> tuple:
+    """
+    Returns (root, k) with root ** k == n and k > 1 a prime, or None.
+    Roots are at least min_root, which bounds the exponents to check.
+    Pollard's rho needs about sqrt(p) steps on p ** k, so powers are
+    taken apart before it.
+    """
+    max_exponent = n.bit_length() // (min_root.bit_length() - 1)
+    for k in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31):
+        if k > max_exponent:
+            return None
+        root = integer_root(n, k)
+        if root ** k == n:
+            return root, k
+    k = 37
+    while k <= max_exponent:
+        if is_probable_prime(k):
+            root = integer_root(n, k)
+            if root ** k == n:
+                return root, k
+        k += 2
+    return None
+
+
+def factorize_large(x: int, sieve: 'Sieve') -> list:
+    """Returns factors of x with multiplicity using Pollard's rho"""
+    factors = []
+    for prime in sieve.primes[:RHO_TRIAL_PRIMES]:
+        while x % prime == 0:
+            factors.append(prime)
+            x //= prime
+
+    # factors left are above the stripped primes
+    min_root = sieve.primes[RHO_TRIAL_PRIMES - 1] + 1
+    stack = [x] if x > 1 else []
+    while stack:
+        n = stack.pop()
+        if n < sieve.bound:
+            factors.extend(sieve.factorize_small(n))
+        elif is_probable_prime(n):
+            factors.append(n)
+        else:
+            power = perfect_power(n, min_root)
+            if power is not None:
+                root, k = power
+                stack.extend([root] * k)
+                continue
+            divisor = brent_rho(n)
+            stack.append(divisor)
+            stack.append(n // divisor)
+    return factors
+
+
+_sieve = None
+_sieve_bound = DEFAULT_SIEVE_BOUND
+
+
+def get_sieve() -> Sieve:
+    """Returns shared sieve, building it on first use"""
+    global _sieve
+    if _sieve is None:
+        _sieve = Sieve(_sieve_bound)
+    return _sieve
+
+
+def set_sieve_bound(bound: int):
+    """Changes bound of shared sieve. The table is rebuilt lazily"""
+    global _sieve, _sieve_bound
+    if bound < 2:
+        raise ValueError('Sieve bound must be at least 2')
+    if bound != _sieve_bound:
+        _sieve_bound = bound
+        _sieve = None
+
+
+CacheInfo = namedtuple(
+    'CacheInfo', ('hits', 'misses', 'evictions', 'maxsize', 'currsize'))
+
+
+class FactorizationCache:
+    """Bounded LRU mapping from numbers to their factors tuples"""
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError('Cache size must be positive')
+        self.maxsize = maxsize
+        self.results = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, x: int, compute) -> tuple:
+        try:
+            result = self.results[x]
+        except KeyError:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.results.move_to_end(x)
+            return result
+
+        result = compute(x)
+        self.results[x] = result
+        if len(self.results) > self.maxsize:
+            self.results.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def clear(self):
+        self.results.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions,
+                         self.maxsize, len(self.results))
+
+
+_cache = None
+
+
+def enable_cache(maxsize: int = 4096):
+    """Turns on memoization of factorize() results, resetting the cache"""
+    global _cache
+    _cache = FactorizationCache(maxsize)
+
+
+def disable_cache():
+    global _cache
+    _cache = None
+
+
+def clear_cache():
+    if _cache is not None:
+        _cache.clear()
+
+
+def cache_info():
+    """Returns CacheInfo of the memoization layer or None if it's off"""
+    return _cache.info() if _cache is not None else None
+
+
+def _factorize(x: int) -> tuple:
+    sieve = get_sieve()
+    if x < min(sieve.bound * sieve.bound, TRIAL_DIVISION_LIMIT):
+        return tuple(sieve.factorize(x))
+    return tuple(sorted(factorize_large(x, sieve)))
+
+
+def factorize(x: int):
+    """
+    Factorize positive integer and return its factors.
+    :type x: int,>=0
+    :rtype: tuple[N],N>0
+    """
+    if not isinstance(x, int):
+        raise TypeError(f'Expected int, got {type(x).__name__}')
+    if x < 0:
+        raise ValueError('Expected non-negative integer')
+    if x in (0, 1):
+        return (x,)
+
+    # validation above runs before lookup, so 1.0 never hits cached 1
+    if _cache is not None:
+        return _cache.get(x, _factorize)
+    return _factorize(x)
+
+
+def _init_worker(bound: int):
+    """Builds the worker's sieve once, before it receives any chunk"""
+    set_sieve_bound(bound)
+    get_sieve()
+
+
+def _factorize_chunk(chunk: list) -> list:
+    results = []
+    for x in chunk:
+        try:
+            results.append(factorize(x))
+        except (TypeError, ValueError) as error:
+            results.append(error)
+    return results
+
+
+def _chunked(iterable, chunksize: int):
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, chunksize))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, chunksize))
+
+
+def factorize_many(iterable, workers: int = None, chunksize: int = 1024):
+    """
+    Factorize every number of iterable and yield results in input order.
+    A bad input yields its TypeError/ValueError instance instead of
+    factors, so one bad item doesn't abort the batch.
+    Chunks of numbers are processed by pool of workers processes,
+    each of them builds the sieve only once. workers=1 runs in-process.
+    """
+    if chunksize < 1:
+        raise ValueError('chunksize must be positive')
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('workers must be positive')
+
+    chunks = _chunked(iterable, chunksize)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _factorize_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(_sieve_bound,)) as executor:
+        # keep a bounded window of chunks in flight to stream the input
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_factorize_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
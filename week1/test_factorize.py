@@ -1,13 +1,7 @@
 import unittest
 
-
-def factorize(x: int):
-    """
-    Factorize positive integer and return its factors.
-    :type x: int,>=0
-    :rtype: tuple[N],N>0
-    """
-    pass
+import factorization
+from factorization import Sieve, factorize, factorize_many
 
 
 class TestFactorize(unittest.TestCase):
@@ -60,3 +54,56 @@ class TestFactorize(unittest.TestCase):
             with self.subTest(x=x):
                 self.assertCountEqual(factorize(x), out_data)
 
+    def test_numbers_above_sieve_bound(self):
+        sieve = Sieve(100)
+        subtests_data = {
+            101: (101,),
+            1001: (7, 11, 13),
+            9699690: (2, 3, 5, 7, 11, 13, 17, 19),
+            10403: (101, 103),
+        }
+        for x, out_data in subtests_data.items():
+            with self.subTest(x=x):
+                self.assertCountEqual(sieve.factorize(x), out_data)
+
+    def test_large_numbers(self):
+        subtests_data = {
+            2 ** 61 - 1: (2 ** 61 - 1,),
+            2 ** 64 + 1: (274177, 67280421310721),
+            4294967311 * 4294967357: (4294967311, 4294967357),
+            (2 ** 31 - 1) * (2 ** 61 - 1): (2 ** 31 - 1, 2 ** 61 - 1),
+            (2 ** 61 - 1) ** 2: (2 ** 61 - 1,) * 2,
+            (2 ** 61 - 1) ** 3: (2 ** 61 - 1,) * 3,
+            ((2 ** 31 - 1) * (2 ** 61 - 1)) ** 2: (2 ** 31 - 1, 2 ** 61 - 1) * 2,
+        }
+        for x, out_data in subtests_data.items():
+            with self.subTest(x=x):
+                self.assertCountEqual(factorize(x), out_data)
+
+    def test_factorize_many(self):
+        in_data = [6, 'string', 121, -1, 0, 2 ** 64 + 1, 1.5, 9699690]
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                results = list(factorize_many(in_data, workers, chunksize=3))
+                self.assertEqual(len(results), len(in_data))
+                for x, result in zip(in_data, results):
+                    if isinstance(x, int) and x >= 0:
+                        self.assertEqual(result, factorize(x))
+                    elif isinstance(x, int):
+                        self.assertIsInstance(result, ValueError)
+                    else:
+                        self.assertIsInstance(result, TypeError)
+
+    def test_cache(self):
+        factorization.enable_cache(maxsize=2)
+        self.addCleanup(factorization.disable_cache)
+
+        for x in (6, 26, 6, 121):
+            factorize(x)
+        self.assertEqual(factorization.cache_info(), (1, 3, 1, 2, 2))
+        self.assertCountEqual(factorize(121), (11, 11))
+        self.assertRaises(TypeError, factorize, 121.0)
+        self.assertRaises(ValueError, factorize, -121)
+
+        factorization.clear_cache()
+        self.assertEqual(factorization.cache_info(), (0, 0, 0, 2, 0))
@@ -1,8 +1,14 @@
+import sys
 import unittest
 
 from test_factorize import TestFactorize
 
 
 if __name__ == '__main__':
-    unittest.main()
+    if '--bench' in sys.argv:
+        import benchmark
+
+        sys.argv.remove('--bench')
+        sys.exit(benchmark.main(sys.argv[1:]))
 
+    unittest.main()
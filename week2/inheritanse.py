@@ -1,5 +1,14 @@
 import math
 from abc import ABC, abstractmethod
+from collections import namedtuple
+
+
+Confusion = namedtuple('Confusion', ('tp', 'fp', 'fn', 'tn'))
+Summary = namedtuple('Summary', ('score', 'loss', 'mean_loss', 'confusion'))
+SweepPoint = namedtuple('SweepPoint', ('threshold', 'pre', 'rec', 'score'))
+
+# Predictions are clipped to [EPSILON, 1 - EPSILON] before taking logs
+EPSILON = 1e-15
 
 
 class Base(ABC):
@@ -7,6 +16,24 @@ class Base(ABC):
         self.data = data
         self.result = result
 
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self._confusion = None
+
+    @property
+    def result(self):
+        return self._result
+
+    @result.setter
+    def result(self, result):
+        self._result = result
+        self._confusion = None
+
     @abstractmethod
     def get_answer(self):
         pass
@@ -25,10 +52,35 @@ class A(Base):
     def get_answer(self):
         return [int(x >= 0.5) for x in self.data]
 
+    def count_confusion(self):
+        """Counts TP/FP/FN/TN of thresholded data in a single pass"""
+        tp = fp = fn = tn = 0
+        for (x, y) in zip(self.data, self.result):
+            if x >= 0.5:
+                if y == 1:
+                    tp += 1
+                else:
+                    fp += 1
+            elif y == 1:
+                fn += 1
+            else:
+                tn += 1
+        return Confusion(tp, fp, fn, tn)
+
+    def get_confusion(self):
+        """Returns confusion counts, cached until data or result is
+        reassigned. In-place changes of them are not tracked"""
+        if self._confusion is None:
+            self._confusion = self.count_confusion()
+        return self._confusion
+
+    @staticmethod
+    def score_from(confusion):
+        """Returns accuracy for confusion counts"""
+        return (confusion.tp + confusion.tn) / sum(confusion)
+
     def get_score(self):
-        ans = self.get_answer()
-        return sum([int(x == y) for (x, y) in zip(ans, self.result)]) \
-            / len(ans)
+        return self.score_from(self.get_confusion())
 
     def get_loss(self):
         return sum(
@@ -38,28 +90,127 @@ class A(Base):
 class B(A):
 
     def get_loss(self):
-        return -sum([
-            y * math.log(x) + (1 - y) * math.log(1 - x)
-            for (x, y) in zip(self.data, self.result)
-        ])
+        """Returns log-loss. Predictions equal to 0 or 1 are clipped and
+        the terms are summed exactly with math.fsum"""
+        low, high = EPSILON, 1 - EPSILON
+        return -math.fsum(
+            y * math.log(x) + (1 - y) * math.log1p(-x)
+            for (x, y) in (
+                (min(max(x, low), high), y)
+                for (x, y) in zip(self.data, self.result)
+            )
+        )
+
+    @staticmethod
+    def pre_from(confusion):
+        return confusion.tp / (confusion.tp + confusion.fp)
+
+    @staticmethod
+    def rec_from(confusion):
+        return confusion.tp / (confusion.tp + confusion.fn)
+
+    @classmethod
+    def score_from(cls, confusion):
+        """Returns F1 score for confusion counts"""
+        pre = cls.pre_from(confusion)
+        rec = cls.rec_from(confusion)
+        return 2 * pre * rec / (pre + rec)
 
     def get_pre(self):
-        ans = self.get_answer()
-        res = [int(x == 1 and y == 1) for (x, y) in zip(ans, self.result)]
-        return sum(res) / sum(ans)
+        return self.pre_from(self.get_confusion())
 
     def get_rec(self):
-        ans = self.get_answer()
-        res = [int(x == 1 and y == 1) for (x, y) in zip(ans, self.result)]
-        return sum(res) / sum(self.result)
+        return self.rec_from(self.get_confusion())
 
     def get_score(self):
-        pre = self.get_pre()
-        rec = self.get_rec()
-        return 2 * pre * rec / (pre + rec)
+        return self.score_from(self.get_confusion())
+
+    @classmethod
+    def point_from(cls, threshold, confusion):
+        """Returns SweepPoint, undefined metrics (division by zero) are
+        None"""
+        metrics = []
+        for metric_from in (cls.pre_from, cls.rec_from, cls.score_from):
+            try:
+                metrics.append(metric_from(confusion))
+            except ZeroDivisionError:
+                metrics.append(None)
+        return SweepPoint(threshold, *metrics)
+
+    def sweep(self, thresholds=None):
+        """
+        Returns SweepPoint for every threshold (answer is x >= threshold)
+        in the given order, or for every distinct score in ascending
+        order if thresholds are omitted. Data is sorted once and counts
+        are accumulated while thresholds decrease, O(n log n + T log T).
+        """
+        pairs = sorted(zip(self.data, self.result), reverse=True)
+        if thresholds is None:
+            thresholds = sorted(set(x for (x, _) in pairs))
+        else:
+            # read twice below, so one-shot iterables are stored first
+            thresholds = list(thresholds)
+        positives = sum(1 for (_, y) in pairs if y == 1)
+        negatives = len(pairs) - positives
+
+        points = {}
+        index = tp = fp = 0
+        for threshold in sorted(set(thresholds), reverse=True):
+            while index < len(pairs) and pairs[index][0] >= threshold:
+                if pairs[index][1] == 1:
+                    tp += 1
+                else:
+                    fp += 1
+                index += 1
+            confusion = Confusion(tp, fp, positives - tp, negatives - fp)
+            points[threshold] = self.point_from(threshold, confusion)
+        return [points[threshold] for threshold in thresholds]
 
 
 class C(A):
 
     def get_loss(self):
         return sum([abs(x - y) for (x, y) in zip(self.data, self.result)])
+
+
+class Accumulator:
+    """
+    Incremental evaluation of metric class (A, B, C or their subclasses)
+    over data coming in chunks. Keeps only running loss and confusion
+    counts, so memory doesn't grow with the number of chunks.
+    """
+
+    def __init__(self, metric_class=A):
+        self.metric_class = metric_class
+        self.count = 0
+        self.loss = 0
+        self._loss_error = 0
+        self.confusion = Confusion(0, 0, 0, 0)
+
+    def update(self, data_chunk, result_chunk):
+        chunk = self.metric_class(data_chunk, result_chunk)
+        self.count += len(chunk.data)
+        self._add_loss(chunk.get_loss())
+        self.confusion = Confusion(*[
+            total + part
+            for (total, part) in zip(self.confusion, chunk.get_confusion())
+        ])
+
+    def _add_loss(self, value):
+        """Neumaier summation, so long runs of chunks don't drift"""
+        total = self.loss + value
+        if abs(self.loss) >= abs(value):
+            self._loss_error += (self.loss - total) + value
+        else:
+            self._loss_error += (value - total) + self.loss
+        self.loss = total
+
+    def compute(self):
+        """Returns metrics of all data seen so far. mean_loss is MSE for
+        A, mean log-loss for B and MAE for C, score is F1 for B"""
+        return Summary(
+            score=self.metric_class.score_from(self.confusion),
+            loss=self.loss + self._loss_error,
+            mean_loss=(self.loss + self._loss_error) / self.count,
+            confusion=self.confusion
+        )
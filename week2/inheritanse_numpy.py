@@ -0,0 +1,81 @@
+import numpy as np
+
+import inheritanse
+
+
+def as_float_array(values) -> np.ndarray:
+    """Returns values as 1D float64 array, without copying contiguous
+    float64 arrays"""
+    return np.ascontiguousarray(values, dtype=np.float64).reshape(-1)
+
+
+class A(inheritanse.A):
+    """NumPy-backed version of inheritanse.A"""
+
+    @inheritanse.A.data.setter
+    def data(self, data):
+        inheritanse.A.data.fset(self, as_float_array(data))
+
+    @inheritanse.A.result.setter
+    def result(self, result):
+        inheritanse.A.result.fset(self, as_float_array(result))
+
+    def get_answer(self):
+        return (self.data >= 0.5).astype(np.int8)
+
+    def count_confusion(self):
+        predicted = self.data >= 0.5
+        actual = self.result == 1
+        tp = int(np.count_nonzero(predicted & actual))
+        fp = int(np.count_nonzero(predicted)) - tp
+        fn = int(np.count_nonzero(actual)) - tp
+        tn = len(self.data) - tp - fp - fn
+        return inheritanse.Confusion(tp, fp, fn, tn)
+
+    def get_loss(self):
+        diff = self.data - self.result
+        return float(np.dot(diff, diff))
+
+
+class B(A, inheritanse.B):
+    """NumPy-backed version of inheritanse.B"""
+
+    def get_loss(self):
+        # np.sum uses pairwise summation, which keeps the error small
+        eps = inheritanse.EPSILON
+        data = np.clip(self.data, eps, 1 - eps)
+        return -float(np.sum(
+            self.result * np.log(data)
+            + (1 - self.result) * np.log1p(-data)
+        ))
+
+    def sweep(self, thresholds=None):
+        order = np.argsort(-self.data, kind='stable')
+        scores = self.data[order]
+        true_positives = np.cumsum(self.result[order] == 1)
+        if thresholds is None:
+            thresholds = np.unique(self.data)
+        elif not isinstance(thresholds, np.ndarray):
+            # NumPy can't build an array from a generator
+            thresholds = list(thresholds)
+        thresholds = as_float_array(thresholds)
+        positives = int(true_positives[-1]) if len(scores) else 0
+        negatives = len(scores) - positives
+
+        # number of scores >= threshold among scores sorted descending
+        answered = len(scores) - np.searchsorted(
+            scores[::-1], thresholds, side='left')
+        points = []
+        for threshold, count in zip(thresholds.tolist(), answered.tolist()):
+            tp = int(true_positives[count - 1]) if count else 0
+            confusion = inheritanse.Confusion(
+                tp, count - tp, positives - tp, negatives - count + tp)
+            points.append(self.point_from(threshold, confusion))
+        return points
+
+
+class C(A, inheritanse.C):
+    """NumPy-backed version of inheritanse.C"""
+
+    def get_loss(self):
+        return float(np.sum(np.abs(self.data - self.result)))
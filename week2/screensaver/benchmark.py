@@ -0,0 +1,125 @@
+import argparse
+import os
+import random
+import time
+import tracemalloc
+
+# must be set before pygame creates the window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from refactored import FrozenVec2d, Knot, Screensaver, Speed2d, Vec2d
+
+
+class DictVec2d:
+    """Vec2d with per-instance __dict__, as it was before __slots__"""
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def __add__(self, other_vector):
+        return DictVec2d(self.x + other_vector.x, self.y + other_vector.y)
+
+
+def get_figure_class(name: str):
+    if name == 'array':
+        from vectorized import ArrayKnot
+        return ArrayKnot
+    return Knot
+
+
+def build_screensaver(figures: int, anchors: int, figure_class=Knot,
+                      seed: int = 0, workers: int = 0,
+                      adaptive: bool = False) -> Screensaver:
+    """Returns screensaver with figures of random anchor points"""
+    rnd = random.Random(seed)
+    random.seed(seed)  # speeds of anchor points
+    screensaver = Screensaver(800, 600, figure_class=figure_class, workers=workers)
+    screensaver.figures = []
+    for _ in range(figures):
+        figure = screensaver.add_figure()
+        figure.adaptive = adaptive
+        for _ in range(anchors):
+            figure.add_anchor_point((rnd.uniform(0, 800), rnd.uniform(0, 600)))
+    return screensaver
+
+
+def run(screensaver: Screensaver, frames: int) -> dict:
+    """Runs frames of simulation, returns timings of every phase in ms"""
+    phases = (
+        ('update', screensaver.move_figures),
+        ('knot', screensaver.update_knots),
+        ('draw', screensaver.draw_frame),
+    )
+    timings = {name: [] for name, _ in phases}
+    for _ in range(frames):
+        for name, phase in phases:
+            start = time.perf_counter()
+            phase()
+            timings[name].append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def vector_benchmark(count: int):
+    """Prints memory per vector and cost of moving a point"""
+    for name, vector_class in (('dict', DictVec2d), ('slots', Vec2d),
+                               ('tuple', FrozenVec2d)):
+        tracemalloc.start()
+        vectors = [vector_class(index, index) for index in range(count)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del vectors
+        print(f'{name:<6} {size / count:6.1f} bytes per vector')
+
+    speed = Speed2d(0.5, 0.5)
+    for name, vector_class, in_place in (('dict +', DictVec2d, False),
+                                         ('slots +', Vec2d, False),
+                                         ('slots +=', Vec2d, True)):
+        point = vector_class(0, 0)
+        start = time.perf_counter()
+        for _ in range(count):
+            if in_place:
+                point += speed
+            else:
+                point = point + speed
+        elapsed = time.perf_counter() - start
+        created = 0 if in_place else count
+        print(f'{name:<9} {elapsed / count * 1e9:6.1f} ns per move, '
+              f'{created} vectors created')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Headless screensaver benchmark')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--figures', type=int, default=10)
+    parser.add_argument('--anchors', type=int, default=50)
+    parser.add_argument('--figure-class', choices=('knot', 'array'), default='knot')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='threads updating figures, 0 updates them in place')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='points per segment depend on its length')
+    parser.add_argument('--vectors', type=int, metavar='COUNT',
+                        help='benchmark vector types instead of frames')
+    args = parser.parse_args(argv)
+
+    if args.vectors:
+        vector_benchmark(args.vectors)
+        return
+
+    screensaver = build_screensaver(
+        args.figures, args.anchors, get_figure_class(args.figure_class),
+        workers=args.workers, adaptive=args.adaptive)
+    timings = run(screensaver, args.frames)
+
+    print(f'{args.frames} frames, {args.figures} figures x {args.anchors} anchors, '
+          f'{args.figure_class}, {args.workers} workers'
+          f'{", adaptive" if args.adaptive else ""}')
+    for name, values in timings.items():
+        values.sort()
+        mean = sum(values) / len(values)
+        p99 = values[min(len(values) - 1, int(0.99 * len(values)))]
+        print(f'{name:<8} mean {mean:8.3f} ms  p99 {p99:8.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
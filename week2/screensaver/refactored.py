@@ -1,12 +1,25 @@
 import math
 import random
 import logging
+from operator import itemgetter, methodcaller
 from typing import Tuple, List, Union
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 import pygame
 
 
+# Limit of simulation ticks per frame, so a slow frame doesn't make
+# the next one even slower
+MAX_TICKS_PER_FRAME = 5
+# bounds and factors of knot detail under frame_budget_ms
+MIN_DETAIL = 0.1
+DETAIL_DECREASE = 0.9
+DETAIL_INCREASE = 1.05
+# Anchor point is hit by a click not farther than this, in pixels
+PICK_RADIUS = 10
+
 logging.basicConfig(
     format='%(levelname)s//%(funcName)s//%(lineno)d: %(message)s',
     level=logging.INFO
@@ -15,6 +28,7 @@ logging.basicConfig(
 
 @dataclass
 class Speed2d:
+    __slots__ = ('x', 'y')
     x: Union[int, float]
     y: Union[int, float]
 
@@ -27,6 +41,8 @@ class Vec2d:
     with center of coordinates (0, 0)
     """
 
+    __slots__ = ('x', 'y')
+
     def __init__(self, x: Union[int, float], y: Union[int, float]):
         self.x = x
         self.y = y
@@ -43,6 +59,18 @@ class Vec2d:
         """Returns the multiplication of the vector by scalar"""
         return Vec2d(self.x * scalar, self.y * scalar)
 
+    def __iadd__(self, other_vector: Union['Vec2d', Speed2d]) -> 'Vec2d':
+        """Adds other vector (or speed) to the vector in place"""
+        self.x += other_vector.x
+        self.y += other_vector.y
+        return self
+
+    def __imul__(self, scalar: Union[int, float]) -> 'Vec2d':
+        """Multiplies the vector by scalar in place"""
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
     def __len__(self) -> int:
         """Returns the length of the vector"""
         return int(math.sqrt(self.x ** 2 + self.y ** 2))
@@ -60,118 +88,430 @@ class Vec2d:
         return self.x, self.y
 
 
+class FrozenVec2d(tuple):
+    """
+    Immutable, hashable 2D vector stored as a plain (x, y) tuple.
+    Supports the same arithmetic as Vec2d, but len() stays 2 as for any
+    pair of coordinates, the length of the vector is length()
+    """
+
+    __slots__ = ()
+
+    x = property(itemgetter(0))
+    y = property(itemgetter(1))
+
+    def __new__(cls, x: Union[int, float], y: Union[int, float]):
+        return tuple.__new__(cls, (x, y))
+
+    def __add__(self, other_vector) -> 'FrozenVec2d':
+        return FrozenVec2d(self[0] + other_vector.x, self[1] + other_vector.y)
+
+    def __sub__(self, other_vector) -> 'FrozenVec2d':
+        return FrozenVec2d(self[0] - other_vector.x, self[1] - other_vector.y)
+
+    def __mul__(self, scalar: Union[int, float]) -> 'FrozenVec2d':
+        return FrozenVec2d(self[0] * scalar, self[1] * scalar)
+
+    def length(self) -> int:
+        """Returns the length of the vector"""
+        return int(math.sqrt(self[0] ** 2 + self[1] ** 2))
+
+    def int_pair(self):
+        return self[0], self[1]
+
+
+class AnchorIndex:
+    """
+    Uniform grid over anchor points of many figures. Points are found by
+    scanning only the cells around the position instead of all points.
+    Figures report added, deleted and moved points to keep it in sync,
+    so anchor_points of indexed figures shouldn't be reassigned directly
+    """
+
+    def __init__(self, cell_size: int = 32):
+        self.cell_size = cell_size
+        self.cells = defaultdict(dict)
+        self.cell_of = {}
+
+    def get_cell(self, x: Union[int, float], y: Union[int, float]) -> Tuple[int, int]:
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, figure: 'Polyline', point: Vec2d):
+        cell = self.get_cell(point.x, point.y)
+        self.cells[cell][id(point)] = (figure, point)
+        self.cell_of[id(point)] = cell
+
+    def remove(self, point: Vec2d):
+        cell = self.cell_of.pop(id(point))
+        del self.cells[cell][id(point)]
+
+    def move(self, point: Vec2d):
+        """Updates the cell of the point after it has moved"""
+        key = id(point)
+        cell = (int(point.x // self.cell_size), int(point.y // self.cell_size))
+        old_cell = self.cell_of[key]
+        if cell != old_cell:
+            self.cells[cell][key] = self.cells[old_cell].pop(key)
+            self.cell_of[key] = cell
+
+    def clear(self):
+        self.cells.clear()
+        self.cell_of.clear()
+
+    def nearest(self, position: Tuple[Union[int, float], Union[int, float]],
+                radius: Union[int, float], figure: 'Polyline' = None):
+        """Returns (distance, figure, point) of the nearest point within
+        radius from position, only among points of figure if it's given,
+        or None"""
+        x, y = position
+        min_x, min_y = self.get_cell(x - radius, y - radius)
+        max_x, max_y = self.get_cell(x + radius, y + radius)
+        best = None
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                cell = self.cells.get((cell_x, cell_y))
+                if not cell:
+                    continue
+                for point_figure, point in cell.values():
+                    if figure is not None and point_figure is not figure:
+                        continue
+                    distance = math.hypot(point.x - x, point.y - y)
+                    if distance <= radius and (best is None or distance < best[0]):
+                        best = (distance, point_figure, point)
+        return best
+
+
 class Polyline:
+    """
+    Closed polyline through anchor points moving over the surface.
+    The surface doesn't have to be a display, figures can be drawn on
+    a plain pygame.Surface, e.g. for benchmarks without a window
+    """
+
+    _anchor_sprites = {}
+    # whether points can be kept in AnchorIndex shared by figures
+    uses_anchor_index = True
 
     def __init__(self, surface: pygame.Surface):
         self.surface = surface
         self.anchor_points: List[Vec2d] = []
         self.speed_of_points: List[Speed2d] = []
+        self.anchor_index: Union[AnchorIndex, None] = None
 
     def add_anchor_point(self, position: Tuple[Union[int, float], Union[int, float]]):
-        self.anchor_points.append(Vec2d(position[0], position[1]))
+        point = Vec2d(position[0], position[1])
+        self.anchor_points.append(point)
         self.speed_of_points.append(Speed2d(random.uniform(0.001, 1.1), random.uniform(0.001, 1.1)))
+        if self.anchor_index is not None:
+            self.anchor_index.insert(self, point)
 
     def delete_anchor_point(self, position: Tuple[Union[int, float], Union[int, float]]):
-        point = Vec2d(position[0], position[1])
-        try:
-            self.anchor_points.remove(point)
-        except ValueError:
-            epsylon = Vec2d(0.5, 0.5)
-            logging.info(f'No {position} point exists. Will try close points')
-            for index in range(len(self.anchor_points)):
-                if point > self.anchor_points[index] - epsylon or\
-                        point < self.anchor_points[index] + epsylon:
-                    self.anchor_points.pop(index)
-                    break
+        """Deletes anchor point at position, returns its index or None"""
+        index = self.find_anchor_point(position)
+        if index is not None:
+            point = self.anchor_points.pop(index)
+            self.speed_of_points.pop(index)
+            if self.anchor_index is not None:
+                self.anchor_index.remove(point)
+        return index
+
+    def find_anchor_point(self, position: Tuple[Union[int, float], Union[int, float]]):
+        """Returns index of anchor point to delete for position or None"""
+        hit = self.nearest_anchor_point(position, PICK_RADIUS)
+        if hit is None:
+            logging.info(f'No point within {PICK_RADIUS}px of {position}')
+            return None
+        return hit[1]
+
+    def nearest_anchor_point(self, position: Tuple[Union[int, float], Union[int, float]],
+                             radius: Union[int, float]):
+        """Returns (distance, index) of the nearest anchor point within
+        radius from position or None"""
+        if self.anchor_index is not None:
+            hit = self.anchor_index.nearest(position, radius, self)
+            if hit is None:
+                return None
+            distance, _, point = hit
+            for index, anchor_point in enumerate(self.anchor_points):
+                if anchor_point is point:
+                    return distance, index
+
+        x, y = position
+        best = None
+        for index, point in enumerate(self.anchor_points):
+            distance = math.hypot(point.x - x, point.y - y)
+            if distance <= radius and (best is None or distance < best[0]):
+                best = (distance, index)
+        return best
 
     def set_points(self):
         """Function for recalculating coordinates of anchor points"""
-        screen_width, screen_height = self.surface.get_size()
-        for index, point in enumerate(self.anchor_points):
-            self.anchor_points[index].x += self.speed_of_points[index].x
-            self.anchor_points[index].y += self.speed_of_points[index].y
+        self.move_points()
 
-            if ((point.x < 0 and self.speed_of_points[index].x < 0) or
-                    (point.x > screen_width and self.speed_of_points[index].x > 0)):
-                self.speed_of_points[index].x = -self.speed_of_points[index].x
-
-            if ((point.y < 0 and self.speed_of_points[index].y < 0) or
-                    (point.y >= screen_height and self.speed_of_points[index].y > 0)):
-                self.speed_of_points[index].y = -self.speed_of_points[index].y
+    def move_points(self):
+        """Moves anchor points by one simulation tick"""
+        screen_width, screen_height = self.surface.get_size()
+        anchor_index = self.anchor_index
+        for point, speed in zip(self.anchor_points, self.speed_of_points):
+            point += speed
+            if anchor_index is not None:
+                anchor_index.move(point)
+
+            if ((point.x < 0 and speed.x < 0) or
+                    (point.x > screen_width and speed.x > 0)):
+                speed.x = -speed.x
+
+            if ((point.y < 0 and speed.y < 0) or
+                    (point.y >= screen_height and speed.y > 0)):
+                speed.y = -speed.y
+
+    @classmethod
+    def get_anchor_sprite(cls, radius: int, color) -> pygame.Surface:
+        """Returns anchor point circle, rendered once per radius and color"""
+        key = (radius, tuple(color))
+        if key not in cls._anchor_sprites:
+            sprite = pygame.Surface((2 * radius + 1, 2 * radius + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            cls._anchor_sprites[key] = sprite
+        return cls._anchor_sprites[key]
+
+    def get_anchor_buffer(self) -> List[Tuple[float, float]]:
+        """Returns coordinates of anchor points ready for drawing"""
+        return [point.int_pair() for point in self.anchor_points]
+
+    def draw_closed_line(self, points, width=3, color=(255, 255, 255), antialiased=False):
+        """Draws closed line through points with a single pygame call"""
+        if len(points) < 2:
+            return
+        if antialiased:
+            pygame.draw.aalines(self.surface, color, True, points)
+        else:
+            pygame.draw.lines(self.surface, color, True, points, width)
 
     def draw_anchor_points(self, radius=3, color=(255, 255, 255)):
-        for point in self.anchor_points:
-            pygame.draw.circle(
-                surface=self.surface,
-                color=color,
-                center=(point.x, point.y),
-                radius=radius
-            )
+        sprite = self.get_anchor_sprite(radius, color)
+        self.surface.blits(
+            [(sprite, (x - radius, y - radius)) for x, y in self.get_anchor_buffer()],
+            False
+        )
 
-    def draw_figure(self, width=3, color=(255, 255, 255)):
-        for index, point in enumerate(self.anchor_points):
-            pygame.draw.line(
-                surface=self.surface,
-                color=color,
-                start_pos=(self.anchor_points[index - 1].x, self.anchor_points[index - 1].y),
-                end_pos=(point.x, point.y),
-                width=width
-            )
+    def draw_figure(self, width=3, color=(255, 255, 255), antialiased=False):
+        self.draw_closed_line(self.get_anchor_buffer(), width, color, antialiased)
 
 
 class Knot(Polyline):
 
-    def __init__(self, surface: pygame.Surface, smoothing_step: int = 15):
+    def __init__(self, surface: pygame.Surface, smoothing_step: int = 15,
+                 adaptive: bool = False, sample_spacing: Union[int, float] = 8):
+        """
+        smoothing_step is the number of points per segment. With adaptive
+        it's only the maximum, each segment gets a point per sample_spacing
+        pixels of its length. detail (0..1] scales the number of points
+        down, e.g. to keep within a frame budget
+        """
         super().__init__(surface)
         self.points_of_knot: List[Vec2d] = []
         self.smoothing_step: int = smoothing_step
-
-    def get_point(self, points, alpha, deg=None) -> Vec2d:
+        self.adaptive = adaptive
+        self.sample_spacing = sample_spacing
+        self.detail = 1.0
+        self._basis = {}
+        # settings and anchor positions points_of_knot were built for,
+        # number of points of every segment
+        self._knot_settings = None
+        self._knot_anchors: List[FrozenVec2d] = []
+        self._knot_counts: List[int] = []
+        self._dirty_segments = set()
+        self._knot_buffer = None
+
+    @staticmethod
+    def get_weights(alpha: float, deg: int) -> List[float]:
+        """
+        Returns weights of base points for the smoothing point at alpha.
+        The curve is p[deg]*a + (p[deg-1]*a + (... + p[0]*(1-a)) ...)*(1-a),
+        so p[k] gets a*(1-a)**(deg-k) and p[0] gets (1-a)**deg
+        """
+        weights = [alpha * (1 - alpha) ** (deg - k) for k in range(deg + 1)]
+        weights[0] = (1 - alpha) ** deg
+        return weights
+
+    def get_basis(self, deg: int, count: int = None) -> List[List[float]]:
+        """Returns weights for count (smoothing_step by default) evenly
+        spaced alphas, computed once per count"""
+        if count is None:
+            count = self.smoothing_step
+        if (count, deg) not in self._basis:
+            alpha = 1 / count
+            self._basis[count, deg] = [
+                self.get_weights(index * alpha, deg)
+                for index in range(count)
+            ]
+        return self._basis[count, deg]
+
+    def get_point(self, points, alpha, deg=None) -> FrozenVec2d:
         if deg is None:
             deg = len(points) - 1
-        if deg == 0:
-            return points[0]
+        weights = self.get_weights(alpha, deg)
 
-        return (points[deg] * alpha) + (self.get_point(points, alpha, deg - 1) * (1 - alpha))
+        return FrozenVec2d(
+            sum(weight * point.x for weight, point in zip(weights, points)),
+            sum(weight * point.y for weight, point in zip(weights, points))
+        )
 
-    def get_smoothing_points(self, base_points: Union[Tuple[Vec2d, Vec2d, Vec2d], List[Vec2d]]):
-        alpha = 1 / self.smoothing_step
+    def get_uniform_step(self) -> int:
+        """Returns number of points per segment without adaptive"""
+        return max(1, round(self.smoothing_step * self.detail))
+
+    def get_segment_count(self, base_points: Tuple[Vec2d, Vec2d, Vec2d]) -> int:
+        """Returns number of points for the segment"""
+        if not self.adaptive:
+            return self.get_uniform_step()
+        start, middle, end = base_points
+        # the control polygon is never shorter than the curve
+        length = len(middle - start) + len(end - middle)
+        count = min(self.smoothing_step, math.ceil(length / self.sample_spacing))
+        return max(1, round(count * self.detail))
+
+    def get_smoothing_points(self, base_points: Union[Tuple[Vec2d, Vec2d, Vec2d], List[Vec2d]],
+                             start: int, count: int = None):
+        """Writes count smoothing points of the segment into points_of_knot
+        starting from start index, reusing existing Vec2d objects"""
+        (x0, y0), (x1, y1), (x2, y2) = (point.int_pair() for point in base_points)
+
+        points_of_knot = self.points_of_knot
+        for index, (w0, w1, w2) in enumerate(self.get_basis(2, count), start):
+            point = points_of_knot[index]
+            point.x = w0 * x0 + w1 * x1 + w2 * x2
+            point.y = w0 * y0 + w1 * y1 + w2 * y2
 
-        for index in range(self.smoothing_step):
-            self.points_of_knot.append(self.get_point(base_points, index * alpha))
+    def add_anchor_point(self, position: Tuple[Union[int, float], Union[int, float]]):
+        super().add_anchor_point(position)
+        if self._knot_settings is not None:
+            self._add_knot_segment()
+
+    def delete_anchor_point(self, position: Tuple[Union[int, float], Union[int, float]]):
+        index = super().delete_anchor_point(position)
+        if index is None or self._knot_settings is None:
+            return index
 
-    def get_knot(self):
-        self.points_of_knot = []
         if len(self.anchor_points) < 3:
+            self._knot_settings = None
+        else:
+            self._delete_knot_segment(index)
+        return index
+
+    def _add_knot_segment(self):
+        """Adds empty segment for the last anchor. The anchor has no
+        snapshot, so its segments get recomputed"""
+        self._knot_counts.append(0)
+        self._knot_anchors.append(None)
+        self._knot_buffer = None
+
+    def _delete_knot_segment(self, index: int):
+        offset = sum(self._knot_counts[:index])
+        del self.points_of_knot[offset:offset + self._knot_counts[index]]
+        del self._knot_counts[index]
+        del self._knot_anchors[index]
+        self._knot_buffer = None
+        count = len(self._knot_anchors)
+        # shift pending segments after the deleted one, the segments which
+        # used the deleted anchor now get other neighbours
+        self._dirty_segments = {
+            segment - (segment > index)
+            for segment in self._dirty_segments if segment != index
+        }
+        self._dirty_segments.update((index % count, (index + 1) % count))
+
+    def get_knot(self):
+        """
+        Updates points_of_knot in place. Segment i depends only on
+        anchors i-2, i-1 and i, so only segments next to anchors that
+        moved, appeared or disappeared since the last call are
+        recomputed. Changing smoothing settings or reassigning
+        anchor_points rebuilds the whole knot.
+        """
+        self._knot_buffer = None
+        anchor_points = self.anchor_points
+        count = len(anchor_points)
+        if count < 3:
+            self.points_of_knot = []
+            self._knot_settings = None
             return
 
-        for index, anchor_point in enumerate(self.anchor_points):
-            self.get_smoothing_points((
-                (self.anchor_points[index - 2] + self.anchor_points[index - 1]) * 0.5,
-                self.anchor_points[index - 1],
-                (self.anchor_points[index - 1] + anchor_point) * 0.5
-            ))
+        anchors = [FrozenVec2d(*point.int_pair()) for point in anchor_points]
+        settings = (self.smoothing_step, self.detail, self.adaptive, self.sample_spacing)
+        if self._knot_settings != settings or len(self._knot_anchors) != count:
+            self.points_of_knot = []
+            self._knot_counts = [0] * count
+            self._knot_settings = settings
+            dirty_segments = range(count)
+        else:
+            dirty_segments = self._dirty_segments
+            for index, (anchor, previous) in enumerate(zip(anchors, self._knot_anchors)):
+                if anchor != previous:
+                    dirty_segments.update((index, (index + 1) % count, (index + 2) % count))
+
+        offsets = [0] * count
+        for index in range(1, count):
+            offsets[index] = offsets[index - 1] + self._knot_counts[index - 1]
+
+        # from the last segment, so resizing one doesn't move the others
+        for index in sorted(dirty_segments, reverse=True):
+            start = anchor_points[index - 2] + anchor_points[index - 1]
+            start *= 0.5
+            end = anchor_points[index - 1] + anchor_points[index]
+            end *= 0.5
+            base_points = (start, anchor_points[index - 1], end)
+
+            segment_count = self.get_segment_count(base_points)
+            offset = offsets[index]
+            if segment_count != self._knot_counts[index]:
+                self.points_of_knot[offset:offset + self._knot_counts[index]] = [
+                    Vec2d(0, 0) for _ in range(segment_count)
+                ]
+                self._knot_counts[index] = segment_count
+            self.get_smoothing_points(base_points, offset, segment_count)
+
+        self._knot_anchors = anchors
+        self._dirty_segments = set()
 
     def set_points(self):
         super().set_points()
         self.get_knot()
 
-    def draw_figure(self, width=3, color=(255, 255, 255)):
-        for index, point in enumerate(self.points_of_knot):
-            pygame.draw.line(
-                surface=self.surface,
-                color=color,
-                start_pos=(self.points_of_knot[index - 1].x, self.points_of_knot[index - 1].y),
-                end_pos=(point.x, point.y),
-                width=width
-            )
+    def get_knot_buffer(self) -> List[Tuple[float, float]]:
+        """Returns coordinates of knot points, rebuilt only after the knot
+        has changed"""
+        if self._knot_buffer is None:
+            self._knot_buffer = [point.int_pair() for point in self.points_of_knot]
+        return self._knot_buffer
+
+    def draw_figure(self, width=3, color=(255, 255, 255), antialiased=False):
+        self.draw_closed_line(self.get_knot_buffer(), width, color, antialiased)
 
         
 class Screensaver:
 
-    def __init__(self, screen_width: int, screen_height: int):
+    def __init__(self, screen_width: int, screen_height: int, figure_class=Knot,
+                 fixed_timestep: bool = False, tick_rate: int = 60, max_fps: int = 0,
+                 workers: int = 0, frame_budget_ms: Union[int, float] = None):
+        """
+        With fixed_timestep points move tick_rate times per second of real
+        time whatever the frame rate is, otherwise they move once per frame.
+        max_fps caps the frame rate, 0 means no cap.
+        With workers > 0 figures are updated in a pool of threads, which
+        pays off for figures doing NumPy work, e.g. vectorized.ArrayKnot.
+        With frame_budget_ms knots get less points while frames take longer
+        than that and more again when there is time left.
+        """
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.fixed_timestep = fixed_timestep
+        self.time_step = 1 / tick_rate
+        self.max_fps = max_fps
+        self.executor = ThreadPoolExecutor(workers) if workers > 0 else None
+        self.frame_budget_ms = frame_budget_ms
+        self.detail = 1.0
         self.__is_working = False
         self.__is_pause = True
         self.__show_help = False
@@ -191,37 +531,136 @@ class Screensaver:
         pygame.init()
         self.surface = pygame.display.set_mode((screen_width, screen_height))
         pygame.display.set_caption("MyScreenSaver")
+        # SysFont scans system fonts, so it's done once here
+        self.__help_fonts = (pygame.font.SysFont('courier', 24),
+                             pygame.font.SysFont('serif', 24))
+        self.__help_surface = None
+        self.__help_key = None
 
-        self.figures = [Knot(self.surface),]
+        self.figure_class = figure_class
+        self.anchor_index = AnchorIndex()
+        self.figures = []
+        self.add_figure()
 
     def start(self):
         self.__is_pause = False
         self.__is_working = True
         for figure in self.figures:
             figure.anchor_points = []
+            figure.speed_of_points = []
+        self.anchor_index.clear()
+        clock = pygame.time.Clock()
+        lag = 0.0
         while self.__is_working:
             for event in pygame.event.get():
                 self.handle_event(event)
 
-            self.surface.fill((0, 0, 0))
-            self.__hue = (self.__hue + 1) % 360
-            self.__color.hsla = (self.__hue, 100, 50, 100)
+            self.draw_frame()
+            pygame.display.flip()
 
+            elapsed = clock.tick(self.max_fps) / 1000
+            if self.frame_budget_ms is not None:
+                # time of the frame itself, without waiting for max_fps
+                self.adjust_detail(clock.get_rawtime())
+            if self.__is_pause:
+                continue
+            if self.fixed_timestep:
+                lag = min(lag + elapsed, MAX_TICKS_PER_FRAME * self.time_step)
+                ticks = int(lag / self.time_step)
+                lag -= ticks * self.time_step
+            else:
+                ticks = 1
+            if ticks:
+                self.move_figures(ticks)
+                self.update_knots()
+
+        if self.executor is not None:
+            self.executor.shutdown()
+        pygame.display.quit()
+        pygame.quit()
+        exit(0)
+
+    def adjust_detail(self, frame_ms: Union[int, float]):
+        """Scales detail of all knots down when frame_ms is over
+        frame_budget_ms and back up when it's well below"""
+        if frame_ms > self.frame_budget_ms:
+            detail = max(MIN_DETAIL, self.detail * DETAIL_DECREASE)
+        elif frame_ms < 0.8 * self.frame_budget_ms:
+            detail = min(1.0, self.detail * DETAIL_INCREASE)
+        else:
+            return
+        if detail != self.detail:
+            self.detail = detail
+            for figure in self.figures:
+                figure.detail = detail
+
+    def add_figure(self) -> Polyline:
+        figure = self.figure_class(self.surface)
+        if isinstance(figure, Knot):
+            figure.detail = self.detail
+        if figure.uses_anchor_index:
+            figure.anchor_index = self.anchor_index
+        self.figures.append(figure)
+        return figure
+
+    def delete_anchor_point(self, position: Tuple[int, int]):
+        """Deletes the anchor point nearest to position among all figures"""
+        hits = []
+        hit = self.anchor_index.nearest(position, PICK_RADIUS)
+        if hit is not None:
+            hits.append((hit[0], hit[1]))
+        for figure in self.figures:
+            if figure.anchor_index is None:
+                hit = figure.nearest_anchor_point(position, PICK_RADIUS)
+                if hit is not None:
+                    hits.append((hit[0], figure))
+        if hits:
+            figure = min(hits, key=lambda hit: hit[0])[1]
+            figure.delete_anchor_point(position)
+
+    def for_each_figure(self, action):
+        """
+        Calls action(figure) for every figure, in the worker pool if there
+        is one. Figures sharing anchor_index are handled in this thread,
+        as the index isn't thread-safe. Returns when all calls are done,
+        so only finished knots get drawn.
+        """
+        if self.executor is None:
             for figure in self.figures:
-                figure.draw_anchor_points()
-                figure.draw_figure(color=self.__color)
+                action(figure)
+            return
 
-                if not self.__is_pause:
-                    figure.set_points()
+        futures = [
+            self.executor.submit(action, figure)
+            for figure in self.figures if figure.anchor_index is None
+        ]
+        for figure in self.figures:
+            if figure.anchor_index is not None:
+                action(figure)
+        for future in futures:
+            future.result()
 
-            if self.__show_help:
-                self.draw_help()
+    def move_figures(self, ticks: int = 1):
+        def move(figure):
+            for _ in range(ticks):
+                figure.move_points()
 
-            pygame.display.flip()
+        self.for_each_figure(move)
 
-        pygame.display.quit()
-        pygame.quit()
-        exit(0)
+    def update_knots(self):
+        self.for_each_figure(methodcaller('get_knot'))
+
+    def draw_frame(self):
+        self.surface.fill((0, 0, 0))
+        self.__hue = (self.__hue + 1) % 360
+        self.__color.hsla = (self.__hue, 100, 50, 100)
+
+        for figure in self.figures:
+            figure.draw_anchor_points()
+            figure.draw_figure(color=self.__color)
+
+        if self.__show_help:
+            self.draw_help()
 
     def handle_event(self, event):
         if event.type == pygame.QUIT:
@@ -240,7 +679,7 @@ class Screensaver:
             if event.key == pygame.K_F1:
                 self.__show_help = not self.__show_help
             if event.key == pygame.K_n:
-                self.figures.append(Knot(self.surface))
+                self.add_figure()
             if event.key == pygame.K_KP_PLUS:
                 for figure in self.figures:
                     figure.smoothing_step += 1
@@ -252,13 +691,21 @@ class Screensaver:
             if event.button == 1:
                 self.figures[-1].add_anchor_point(event.pos)
             else:
-                for figure in self.figures:
-                    figure.delete_anchor_point(event.pos)
+                self.delete_anchor_point(event.pos)
 
     def draw_help(self):
-        self.surface.fill((50, 50, 50))
-        font1 = pygame.font.SysFont('courier', 24)
-        font2 = pygame.font.SysFont('serif', 24)
+        """Blits help overlay, rendering it again only when the screen size
+        or the command list has changed"""
+        key = (self.screen_width, self.screen_height, tuple(self.__help_commands))
+        if self.__help_key != key:
+            self.__help_surface = self.render_help()
+            self.__help_key = key
+        self.surface.blit(self.__help_surface, (0, 0))
+
+    def render_help(self) -> pygame.Surface:
+        help_surface = pygame.Surface((self.screen_width, self.screen_height))
+        help_surface.fill((50, 50, 50))
+        font1, font2 = self.__help_fonts
         frame_coordinates = [
             (0, 0),
             (self.screen_width, 0),
@@ -267,7 +714,7 @@ class Screensaver:
         ]
 
         pygame.draw.lines(
-            surface=self.surface,
+            surface=help_surface,
             color=(255, 50, 50, 255),
             closed=True,
             points=frame_coordinates,
@@ -275,15 +722,16 @@ class Screensaver:
         )
 
         for index, text in enumerate(self.__help_commands):
-            self.surface.blit(
+            help_surface.blit(
                 source=font1.render(text[0], True, (128, 128, 255)),
                 dest=(100, 100 + 30 * index)
             )
 
-            self.surface.blit(
+            help_surface.blit(
                 source=font2.render(text[1], True, (128, 128, 255)),
                 dest=(500, 100 + 30 * index)
             )
+        return help_surface
 
 
 if __name__ == '__main__':
@@ -4,6 +4,7 @@
 import pygame
 import random
 import math
+from functools import lru_cache
 
 SCREEN_DIM = (800, 600)
 
@@ -56,10 +57,9 @@ def draw_points(points, style="points", width=3, color=(255, 255, 255)):
 
 
 def draw_help():
-    """функция отрисовки экрана справки программы"""
-    gameDisplay.fill((50, 50, 50))
-    font1 = pygame.font.SysFont("courier", 24)
-    font2 = pygame.font.SysFont("serif", 24)
+    """функция отрисовки экрана справки программы, экран рисуется заново
+    только при изменении размера окна или текста справки"""
+    global help_surface, help_key
     data = []
     data.append(["F1", "Show Help"])
     data.append(["R", "Restart"])
@@ -69,32 +69,57 @@ def draw_help():
     data.append(["", ""])
     data.append([str(steps), "Current points"])
 
-    pygame.draw.lines(gameDisplay, (255, 50, 50, 255), True, [
+    key = (gameDisplay.get_size(), tuple(map(tuple, data)))
+    if key != help_key:
+        help_surface = render_help(data)
+        help_key = key
+    gameDisplay.blit(help_surface, (0, 0))
+
+
+def render_help(data):
+    """возвращает поверхность с экраном справки"""
+    surface = pygame.Surface(gameDisplay.get_size())
+    surface.fill((50, 50, 50))
+    pygame.draw.lines(surface, (255, 50, 50, 255), True, [
         (0, 0), (800, 0), (800, 600), (0, 600)], 5)
     for i, text in enumerate(data):
-        gameDisplay.blit(font1.render(
+        surface.blit(font1.render(
             text[0], True, (128, 128, 255)), (100, 100 + 30 * i))
-        gameDisplay.blit(font2.render(
+        surface.blit(font2.render(
             text[1], True, (128, 128, 255)), (200, 100 + 30 * i))
+    return surface
 
 
 # =======================================================================================
 # Функции, отвечающие за расчет сглаживания ломаной
 # =======================================================================================
+def get_weights(alpha, deg):
+    """возвращает веса опорных точек в точке alpha: рекурсия
+    p[deg]*a + (...)*(1-a) дает p[k] вес a*(1-a)**(deg-k), а p[0] - (1-a)**deg"""
+    weights = [alpha * (1 - alpha) ** (deg - k) for k in range(deg + 1)]
+    weights[0] = (1 - alpha) ** deg
+    return weights
+
+
+@lru_cache(maxsize=16)
+def get_basis(count, deg):
+    """возвращает веса для всех count значений alpha, считается один раз на count"""
+    alpha = 1 / count
+    return tuple(tuple(get_weights(i * alpha, deg)) for i in range(count))
+
+
 def get_point(points, alpha, deg=None):
     if deg is None:
         deg = len(points) - 1
-    if deg == 0:
-        return points[0]
-    return add(mul(points[deg], alpha), mul(get_point(points, alpha, deg - 1), 1 - alpha))
+    weights = get_weights(alpha, deg)
+    return (sum(w * p[0] for w, p in zip(weights, points)),
+            sum(w * p[1] for w, p in zip(weights, points)))
 
 
 def get_points(base_points, count):
-    alpha = 1 / count
-    res = []
-    for i in range(count):
-        res.append(get_point(base_points, i * alpha))
-    return res
+    (x0, y0), (x1, y1), (x2, y2) = base_points
+    return [(w0 * x0 + w1 * x1 + w2 * x2, w0 * y0 + w1 * y1 + w2 * y2)
+            for w0, w1, w2 in get_basis(count, 2)]
 
 
 def get_knot(points, count):
@@ -128,6 +153,11 @@ if __name__ == "__main__":
     pygame.init()
     gameDisplay = pygame.display.set_mode(SCREEN_DIM)
     pygame.display.set_caption("MyScreenSaver")
+    # поиск шрифтов медленный, поэтому выполняется один раз при запуске
+    font1 = pygame.font.SysFont("courier", 24)
+    font2 = pygame.font.SysFont("serif", 24)
+    help_surface = None
+    help_key = None
 
     steps = 35
     working = True
@@ -0,0 +1,170 @@
+import random
+from typing import Tuple, List, Union
+
+import numpy as np
+
+from refactored import Knot, Polyline, Screensaver, Speed2d, Vec2d
+
+
+class ArrayPolyline(Polyline):
+    """
+    Polyline that keeps anchor points and their speeds as Nx2 float
+    arrays (positions and velocities) and moves all of them at once.
+    anchor_points and speed_of_points are built from the arrays on
+    access, so changing returned objects doesn't move the figure.
+    Points are hit-tested over the arrays instead of AnchorIndex, so
+    moving them stays vectorized.
+    """
+
+    uses_anchor_index = False
+
+    @property
+    def anchor_points(self) -> List[Vec2d]:
+        return [Vec2d(x, y) for x, y in self.positions.tolist()]
+
+    @anchor_points.setter
+    def anchor_points(self, points: List[Vec2d]):
+        self.positions = np.array(
+            [point.int_pair() for point in points], dtype=float
+        ).reshape(-1, 2)
+        if len(getattr(self, 'velocities', ())) != len(self.positions):
+            self.velocities = np.zeros_like(self.positions)
+
+    @property
+    def speed_of_points(self) -> List[Speed2d]:
+        return [Speed2d(x, y) for x, y in self.velocities.tolist()]
+
+    @speed_of_points.setter
+    def speed_of_points(self, speeds: List[Speed2d]):
+        self.velocities = np.array(
+            [(speed.x, speed.y) for speed in speeds], dtype=float
+        ).reshape(-1, 2)
+
+    def add_anchor_point(self, position: Tuple[Union[int, float], Union[int, float]]):
+        speed = (random.uniform(0.001, 1.1), random.uniform(0.001, 1.1))
+        self.positions = np.vstack((self.positions, position))
+        self.velocities = np.vstack((self.velocities, speed))
+
+    def delete_anchor_point(self, position: Tuple[Union[int, float], Union[int, float]]):
+        index = self.find_anchor_point(position)
+        if index is not None:
+            self.positions = np.delete(self.positions, index, axis=0)
+            self.velocities = np.delete(self.velocities, index, axis=0)
+        return index
+
+    def nearest_anchor_point(self, position: Tuple[Union[int, float], Union[int, float]],
+                             radius: Union[int, float]):
+        if not len(self.positions):
+            return None
+        distances = np.hypot(*(self.positions - position).T)
+        index = int(np.argmin(distances))
+        if distances[index] > radius:
+            return None
+        return float(distances[index]), index
+
+    def move_points(self):
+        """Moves all anchor points and reflects those which left the
+        screen moving outwards"""
+        screen_width, screen_height = self.surface.get_size()
+        positions, velocities = self.positions, self.velocities
+        positions += velocities
+
+        x, y = positions[:, 0], positions[:, 1]
+        speed_x, speed_y = velocities[:, 0], velocities[:, 1]
+        bounce_x = ((x < 0) & (speed_x < 0)) | ((x > screen_width) & (speed_x > 0))
+        bounce_y = ((y < 0) & (speed_y < 0)) | ((y >= screen_height) & (speed_y > 0))
+        speed_x[bounce_x] *= -1
+        speed_y[bounce_y] *= -1
+
+    def get_anchor_buffer(self) -> List[Tuple[float, float]]:
+        return self.positions.tolist()
+
+
+class ArrayKnot(Knot, ArrayPolyline):
+    """
+    Knot over ArrayPolyline, smoothing all dirty segments with one
+    array expression. Knot points stay in an array until they are
+    drawn, so the knot can be computed outside of the render thread.
+    Segments share one number of points, so adaptive is not supported,
+    detail still applies.
+    """
+
+    @property
+    def points_of_knot(self) -> List[Vec2d]:
+        return [Vec2d(x, y) for x, y in self.get_knot_buffer()]
+
+    @points_of_knot.setter
+    def points_of_knot(self, points: List[Vec2d]):
+        """Knot points are computed from anchors, only clearing is allowed"""
+        if points:
+            raise ValueError('ArrayKnot points can only be cleared')
+        self._knot_settings = None
+        self._knot_buffer = None
+
+    def _add_knot_segment(self):
+        step = self._knot_points.shape[1]
+        self._knot_points = np.concatenate((self._knot_points, np.zeros((1, step, 2))))
+        # NaN never equals a position, so the new anchor counts as moved
+        self._knot_anchors = np.vstack((self._knot_anchors, (np.nan, np.nan)))
+        self._knot_buffer = None
+
+    def _delete_knot_segment(self, index: int):
+        self._knot_points = np.delete(self._knot_points, index, axis=0)
+        self._knot_anchors = np.delete(self._knot_anchors, index, axis=0)
+        self._knot_buffer = None
+        count = len(self._knot_anchors)
+        # shift pending segments after the deleted one, the segments which
+        # used the deleted anchor now get other neighbours
+        self._dirty_segments = {
+            segment - (segment > index)
+            for segment in self._dirty_segments if segment != index
+        }
+        self._dirty_segments.update((index % count, (index + 1) % count))
+
+    def get_knot_buffer(self) -> List[Tuple[float, float]]:
+        if self._knot_buffer is None:
+            self._knot_buffer = (
+                self._knot_points.reshape(-1, 2).tolist()
+                if self._knot_settings is not None else []
+            )
+        return self._knot_buffer
+
+    def get_knot(self):
+        self._knot_buffer = None
+        positions = self.positions
+        count = len(positions)
+        if count < 3:
+            self.points_of_knot = []
+            return
+
+        step = self.get_uniform_step()
+        if self._knot_settings != step or len(self._knot_anchors) != count:
+            self._knot_points = np.empty((count, step, 2))
+            self._knot_settings = step
+            dirty = np.ones(count, dtype=bool)
+        else:
+            moved = np.any(positions != self._knot_anchors, axis=1)
+            dirty = moved | np.roll(moved, 1) | np.roll(moved, 2)
+            dirty[list(self._dirty_segments)] = True
+        self._knot_anchors = positions.copy()
+        self._dirty_segments = set()
+        if not dirty.any():
+            return
+
+        segments = np.flatnonzero(dirty)
+        previous = positions[segments - 2]
+        current = positions[segments - 1]
+        base_points = np.stack((
+            (previous + current) * 0.5,
+            current,
+            (current + positions[segments]) * 0.5
+        ), axis=1)
+        basis = np.array(self.get_basis(2, step))
+
+        # (steps, 3) x (segments, 3, 2) -> (segments, steps, 2)
+        self._knot_points[segments] = np.einsum('sk,nkd->nsd', basis, base_points)
+
+
+if __name__ == '__main__':
+    screensaver = Screensaver(800, 600, figure_class=ArrayKnot)
+    screensaver.start()
@@ -1,7 +1,14 @@
-from abc import ABC, abstractmethod
+from abc import ABC
 
 
-class Hero:
+# stats changed by effects on all basic stats
+BASIC_STATS = ("Strength", "Perception", "Endurance", "Charisma",
+               "Intelligence", "Agility", "Luck")
+# order of stats in delta vectors
+STAT_NAMES = ("HP", "MP", "SP") + BASIC_STATS
+
+
+class Hero(ABC):
     """Represents main hero of ... game with positive/negative effects on it"""
 
     def __init__(self):
@@ -20,43 +27,189 @@ class Hero:
             "Agility": 8,  # ловкость
             "Luck": 1,  # удача
         }
+        # incremented when an effect in a stack on the hero gets a new base,
+        # so effects above it fold their stats again
+        self._effects_version = 0
 
     def get_positive_effects(self):
-        return self.positive_effects.copy()
+        return tuple(self.positive_effects)
 
     def get_negative_effects(self):
-        return self.negative_effects.copy()
+        return tuple(self.negative_effects)
 
     def get_stats(self):
         return self.stats.copy()
 
 
-class AbstractEffect(Hero, ABC):
-    """Realises decorator pattern for effects that can be imposed on hero"""
+@Hero.register
+class AbstractEffect(ABC):
+    """Realises decorator pattern for effects that can be imposed on hero.
+
+    Effects are registered as virtual subclasses of Hero, so they pass
+    isinstance(effect, Hero) without carrying stats and effect lists of
+    their own. Subclasses should declare __slots__ to stay without
+    __dict__.
+
+    Effects changing stats by constants only declare them in stat_deltas.
+    Deltas of such effects are folded once, when the effect is created or
+    the stack below it changes, so get_stats doesn't walk the stack.
+    Effects with other rules override get_stats and leave stat_deltas None.
+    Effects with neither are abstract and can't be created.
+
+    Effect names are returned as tuples (not lists, as Hero did before),
+    cached on the effect until the stack below it changes. An effect adds
+    effect_name to them. Effects overriding get_*_effects get tuples from
+    the base too, so they extend them with + ("Name",) instead of append.
+    Effects without effect_name which don't override them are skipped.
+    """
+
+    __slots__ = ('_base', '_hero', '_stat_source', '_stat_modifiers',
+                 '_compiled_version', '_positive_effects', '_negative_effects')
+
+    stat_deltas = None
+    # name of the effect in positive effects if is_positive else in negative
+    effect_name = None
+    is_positive = None
 
     def __init__(self, base):
-        super().__init__()
-        self.base = base
+        cls = type(self)
+        if cls.stat_deltas is None and cls.get_stats is AbstractEffect.get_stats:
+            raise TypeError(f"Can't instantiate abstract class {cls.__name__} "
+                            f"without stat_deltas or get_stats")
+        self._base = base
+        self._compiled_version = None
+        self.compile_stats()
+
+    @property
+    def base(self):
+        return self._base
+
+    @base.setter
+    def base(self, base):
+        # makes this effect and the effects above it stale
+        self._hero._effects_version += 1
+        self._base = base
+        self.compile_stats()
+
+    @classmethod
+    def get_delta_vector(cls):
+        """Returns stat_deltas as a tuple in STAT_NAMES order"""
+        if cls.stat_deltas is None:
+            raise TypeError(f"{cls.__name__} doesn't change stats by constants")
+        return tuple(cls.stat_deltas.get(stat_name, 0) for stat_name in STAT_NAMES)
+
+    def _compile_layer(self):
+        """Folds stat_deltas into deltas of the base. Stats are then read
+        from _stat_source (the hero or the nearest effect overriding
+        get_stats) plus _stat_modifiers"""
+        base = self._base
+        if isinstance(base, AbstractEffect):
+            self._hero = base._hero
+            if base.stat_deltas is not None:
+                source = base._stat_source
+                modifiers = base._stat_modifiers.copy()
+            else:
+                source, modifiers = base, {}
+        else:
+            self._hero = base
+            source, modifiers = base, {}
+
+        for stat_name, delta in (self.stat_deltas or {}).items():
+            modifiers[stat_name] = modifiers.get(stat_name, 0) + delta
+        self._stat_source = source
+        self._stat_modifiers = modifiers
+        self._positive_effects = None
+        self._negative_effects = None
+        self._compiled_version = self._hero._effects_version
+
+    def _is_stale(self):
+        return (self._compiled_version is None
+                or self._compiled_version != self._hero._effects_version)
+
+    def compile_stats(self):
+        """Folds stats again for this effect and the effects below it whose
+        base changed. Goes down the stack in a loop, so deep stacks don't
+        hit the recursion limit"""
+        stale = []
+        layer = self
+        while isinstance(layer, AbstractEffect) and layer._is_stale():
+            stale.append(layer)
+            layer = layer.base
+        for layer in reversed(stale):
+            layer._compile_layer()
+
+    def remove_effect(self, effect):
+        """Removes effect from the stack under this effect (including it).
+        effect is an effect of the stack or an effect class, then the
+        topmost effect of that class is removed. The effect above is
+        relinked to the base of the removed one and the effects above
+        refold lazily, none is created again. Returns top of the stack"""
+        above, layer = None, self
+        while isinstance(layer, AbstractEffect):
+            if layer is effect or (isinstance(effect, type)
+                                   and isinstance(layer, effect)):
+                if above is None:
+                    return layer.base
+                above.base = layer.base
+                return self
+            above, layer = layer, layer.base
+        raise ValueError(f"{effect!r} is not in the stack")
+
+    def _get_effect_names(self, positive):
+        if self._is_stale():
+            self.compile_stats()
+        cache_name = "_positive_effects" if positive else "_negative_effects"
+        cached = getattr(self, cache_name)
+        if cached is not None:
+            return cached
+
+        # goes down to an effect with cached names, an effect with its own
+        # get_*_effects or the hero, collecting names on the way. This
+        # effect is never asked, an override of it may be calling super()
+        getter_name = "get_positive_effects" if positive else "get_negative_effects"
+        names = []
+        layer = self
+        while True:
+            if not isinstance(layer, AbstractEffect) or (
+                    layer is not self and getattr(type(layer), getter_name)
+                    is not getattr(AbstractEffect, getter_name)):
+                source = getattr(layer, getter_name)()
+                break
+            source = getattr(layer, cache_name)
+            if source is not None:
+                break
+            if layer.effect_name is not None and layer.is_positive == positive:
+                names.append(layer.effect_name)
+            layer = layer.base
+
+        names.reverse()
+        effects = tuple(source) + tuple(names)
+        setattr(self, cache_name, effects)
+        return effects
 
-    @abstractmethod
     def get_positive_effects(self):
-        return self.base.get_positive_effects()
+        return self._get_effect_names(True)
 
-    @abstractmethod
     def get_negative_effects(self):
-        return self.base.get_negative_effects()
+        return self._get_effect_names(False)
 
-    @abstractmethod
     def get_stats(self):
-        return self.base.get_stats()
+        if self._is_stale():
+            self.compile_stats()
+        stats_copy = self._stat_source.get_stats()
+        for stat_name, delta in self._stat_modifiers.items():
+            stats_copy[stat_name] += delta
+
+        return stats_copy
 
 
 class AbstractPositive(AbstractEffect):
     """Abstract decorator, represents positive effects that can be imposed
     on hero"""
 
-    def get_negative_effects(self):
-        return self.base.get_negative_effects()
+    __slots__ = ()
+
+    is_positive = True
 
 
 class Berserk(AbstractPositive):
@@ -67,23 +220,14 @@ class Berserk(AbstractPositive):
     Increases Health Points by 50.
     """
 
-    def get_stats(self):
-        stats_copy = self.base.get_stats()
-
-        for stat_name in ("Strength", "Endurance", "Agility", "Luck"):
-            stats_copy[stat_name] += 7
-        for stat_name in ("Perception", "Charisma", "Intelligence"):
-            stats_copy[stat_name] -= 3
+    __slots__ = ()
 
-        stats_copy["HP"] += 50
-
-        return stats_copy
-
-    def get_positive_effects(self):
-        positive_effects_copy = self.base.get_positive_effects()
-        positive_effects_copy.append("Berserk")
-
-        return positive_effects_copy
+    effect_name = "Berserk"
+    stat_deltas = {
+        "Strength": 7, "Endurance": 7, "Agility": 7, "Luck": 7,
+        "Perception": -3, "Charisma": -3, "Intelligence": -3,
+        "HP": 50,
+    }
 
 
 class Blessing(AbstractPositive):
@@ -92,29 +236,19 @@ class Blessing(AbstractPositive):
     Increases all basic stats by 2.
     """
 
-    def get_stats(self):
-        stats_copy = self.base.get_stats()
-
-        for stat_name in stats_copy.keys():
-            if stat_name in ('HP', 'SP', 'MP'):
-                continue
-            stats_copy[stat_name] += 2
-
-        return stats_copy
-
-    def get_positive_effects(self):
-        positive_effects_copy = self.base.get_positive_effects()
-        positive_effects_copy.append("Blessing")
+    __slots__ = ()
 
-        return positive_effects_copy
+    effect_name = "Blessing"
+    stat_deltas = {stat_name: 2 for stat_name in BASIC_STATS}
 
 
 class AbstractNegative(AbstractEffect):
     """Abstract decorator, represents negative effects that can be imposed
     on hero"""
 
-    def get_positive_effects(self):
-        return self.base.get_positive_effects()
+    __slots__ = ()
+
+    is_positive = False
 
 
 class Weakness(AbstractNegative):
@@ -123,19 +257,10 @@ class Weakness(AbstractNegative):
     Decreases stats: Strength, Endurance, Agility by 4.
     """
 
-    def get_stats(self):
-        stats_copy = self.base.get_stats()
-
-        for stat_name in ("Strength", "Endurance", "Agility"):
-            stats_copy[stat_name] -= 4
-
-        return stats_copy
-
-    def get_negative_effects(self):
-        negative_effects_copy = self.base.get_negative_effects()
-        negative_effects_copy.append("Weakness")
+    __slots__ = ()
 
-        return negative_effects_copy
+    effect_name = "Weakness"
+    stat_deltas = {"Strength": -4, "Endurance": -4, "Agility": -4}
 
 
 class Curse(AbstractNegative):
@@ -144,21 +269,10 @@ class Curse(AbstractNegative):
     Decreases all stats by 2 except HP, MP, SP
     """
 
-    def get_stats(self):
-        stats_copy = self.base.get_stats()
-
-        for stat_name in stats_copy.keys():
-            if stat_name in ('HP', 'MP', 'SP'):
-                continue
-            stats_copy[stat_name] -= 2
-
-        return stats_copy
-
-    def get_negative_effects(self):
-        negative_effects_copy = self.base.get_negative_effects()
-        negative_effects_copy.append("Curse")
+    __slots__ = ()
 
-        return negative_effects_copy
+    effect_name = "Curse"
+    stat_deltas = {stat_name: -2 for stat_name in BASIC_STATS}
 
 
 class EvilEye(AbstractNegative):
@@ -167,14 +281,7 @@ class EvilEye(AbstractNegative):
     Decreases Luck by 10
     """
 
-    def get_stats(self):
-        stats_copy = self.base.get_stats()
-        stats_copy["Luck"] -= 10
-
-        return stats_copy
-
-    def get_negative_effects(self):
-        negative_effects_copy = self.base.get_negative_effects()
-        negative_effects_copy.append("EvilEye")
+    __slots__ = ()
 
-        return negative_effects_copy
+    effect_name = "EvilEye"
+    stat_deltas = {"Luck": -10}
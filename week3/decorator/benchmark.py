@@ -0,0 +1,82 @@
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+
+from abstractdecorator import Berserk, Blessing, Curse, EvilEye, Hero, Weakness
+
+EFFECT_CLASSES = (Berserk, Blessing, Weakness, Curse, EvilEye)
+METHODS = ('get_stats', 'get_positive_effects', 'get_negative_effects')
+
+
+def build_stack(depth: int, seed: int = 0):
+    """Returns hero under depth random effects"""
+    rnd = random.Random(seed)
+    hero = Hero()
+    for _ in range(depth):
+        hero = rnd.choice(EFFECT_CLASSES)(hero)
+    return hero
+
+
+def time_calls(depth: int, repeat: int, seed: int = 0) -> dict:
+    """Returns ms per call of every method on a fresh stack (cold) and
+    on a stack it was already called on (warm)"""
+    timings = {}
+    for name in METHODS:
+        cold = 0.0
+        for index in range(repeat):
+            hero = build_stack(depth, seed + index)
+            start = time.perf_counter()
+            getattr(hero, name)()
+            cold += time.perf_counter() - start
+
+        method = getattr(hero, name)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            method()
+        warm = time.perf_counter() - start
+        timings[name] = (cold / repeat * 1000, warm / repeat * 1000)
+    return timings
+
+
+def trace_allocations(depth: int, seed: int = 0) -> dict:
+    """Returns bytes held by a stack and peak bytes allocated by the first
+    and by a repeated call of every method"""
+    tracemalloc.start()
+    hero = build_stack(depth, seed)
+    allocations = {'stack': tracemalloc.get_traced_memory()[0]}
+    for name in METHODS:
+        peaks = []
+        for _ in range(2):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            getattr(hero, name)()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        allocations[name] = tuple(peaks)
+    tracemalloc.stop()
+    return allocations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark of effect stacks')
+    parser.add_argument('--depths', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f'recursion limit {sys.getrecursionlimit()}, {args.repeat} calls')
+    for depth in args.depths:
+        timings = time_calls(depth, args.repeat, args.seed)
+        allocations = trace_allocations(depth, args.seed)
+        print(f'depth {depth}: stack {allocations["stack"] / max(depth, 1):.1f} '
+              f'bytes per effect')
+        for name in METHODS:
+            cold, warm = timings[name]
+            first, repeated = allocations[name]
+            print(f'  {name:<21} cold {cold:8.4f} ms  warm {warm:8.4f} ms  '
+                  f'peak {first:7d} / {repeated:5d} bytes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+from functools import lru_cache
+
+import numpy as np
+
+from abstractdecorator import STAT_NAMES, Hero
+
+
+@lru_cache(maxsize=None)
+def get_delta_array(effect_class) -> np.ndarray:
+    """Returns delta vector of effect_class as read-only array"""
+    deltas = np.array(effect_class.get_delta_vector(), dtype=np.int32)
+    deltas.setflags(write=False)
+    return deltas
+
+
+class HeroTable:
+    """
+    Stats of many heroes as rows of an int32 array, columns are in
+    STAT_NAMES order. Effects are applied to a group of rows with one
+    array operation, only effects with stat_deltas are supported.
+    rows is anything NumPy can index the first axis with: an index,
+    a slice, an array of indices (repeated indices get the effect
+    repeatedly) or a boolean mask. None means all heroes.
+    """
+
+    def __init__(self, count=0):
+        self.stats = np.tile(self.get_default_row(), (count, 1))
+
+    @staticmethod
+    def get_default_row() -> np.ndarray:
+        stats = Hero().get_stats()
+        return np.array([stats[stat_name] for stat_name in STAT_NAMES], dtype=np.int32)
+
+    @classmethod
+    def from_heroes(cls, heroes):
+        """Returns table with stats of heroes (or effect stacks on them)"""
+        table = cls()
+        table.stats = np.array([
+            [stats[stat_name] for stat_name in STAT_NAMES]
+            for stats in (hero.get_stats() for hero in heroes)
+        ], dtype=np.int32).reshape(-1, len(STAT_NAMES))
+        return table
+
+    def __len__(self):
+        return len(self.stats)
+
+    def add_heroes(self, count) -> range:
+        """Adds count heroes with default stats, returns their rows"""
+        start = len(self.stats)
+        self.stats = np.concatenate(
+            (self.stats, np.tile(self.get_default_row(), (count, 1))))
+        return range(start, start + count)
+
+    def _add(self, deltas, rows):
+        if rows is None:
+            self.stats += deltas
+        else:
+            np.add.at(self.stats, rows, deltas)
+
+    def apply(self, effect_class, rows=None):
+        self._add(get_delta_array(effect_class), rows)
+
+    def remove(self, effect_class, rows=None):
+        self._add(-get_delta_array(effect_class), rows)
+
+    def get_column(self, stat_name) -> np.ndarray:
+        return self.stats[:, STAT_NAMES.index(stat_name)]
+
+    def get_stats(self, row):
+        """Returns stats of the hero as dict, like Hero.get_stats"""
+        return dict(zip(STAT_NAMES, self.stats[row].tolist()))